@@ -401,7 +401,7 @@ class CortexCLI:
             console.print("  create <name>              Create a sandbox environment")
             console.print("  install <name> <package>   Install package in sandbox")
             console.print("  test <name> [package]      Run tests in sandbox")
-            console.print("  promote <name> <package>   Install tested package on main system")
+            console.print("  promote <name> <pkg...>    Install tested packages on main system")
             console.print("  cleanup <name>             Remove sandbox environment")
             console.print("  list                       List all sandboxes")
             console.print("  exec <name> <cmd...>       Execute command in sandbox")
@@ -513,14 +513,15 @@ class CortexCLI:
             return 1
 
     def _sandbox_promote(self, sandbox, args: argparse.Namespace) -> int:
-        """Promote a tested package to main system."""
+        """Promote tested packages to main system."""
         name = args.name
-        package = args.package
+        packages = args.package if isinstance(args.package, list) else [args.package]
+        package = " ".join(packages)
         dry_run = getattr(args, "dry_run", False)
         skip_confirm = getattr(args, "yes", False)
 
         if dry_run:
-            result = sandbox.promote(name, package, dry_run=True)
+            result = sandbox.promote(name, packages, dry_run=True)
             cx_print(f"Would run: sudo apt-get install -y {package}", "info")
             return 0
 
@@ -538,7 +539,7 @@ class CortexCLI:
                 return 0
 
         cx_print(f"Installing '{package}' on main system...", "info")
-        result = sandbox.promote(name, package, dry_run=False)
+        result = sandbox.promote(name, packages, dry_run=False)
 
         if result.success:
             cx_print(f"✓ {package} installed on main system", "success")
@@ -2243,12 +2244,12 @@ def main():
     sandbox_test_parser.add_argument("name", help="Sandbox name")
     sandbox_test_parser.add_argument("package", nargs="?", help="Specific package to test")
 
-    # sandbox promote <name> <package> [--dry-run]
+    # sandbox promote <name> <package...> [--dry-run]
     sandbox_promote_parser = sandbox_subs.add_parser(
-        "promote", help="Install tested package on main system"
+        "promote", help="Install tested packages on main system"
     )
     sandbox_promote_parser.add_argument("name", help="Sandbox name")
-    sandbox_promote_parser.add_argument("package", help="Package to promote")
+    sandbox_promote_parser.add_argument("package", nargs="+", help="Package(s) to promote")
     sandbox_promote_parser.add_argument(
         "--dry-run", action="store_true", help="Show command without executing"
     )
@@ -14,6 +14,11 @@ from dataclasses import asdict, dataclass
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# "Depends:"/"Recommends:" lines of `apt-cache depends` output
+_APT_DEPENDS_RE = re.compile(r"^\s*(Depends|Recommends):(.*?)\s*$", re.MULTILINE)
+# Version constraint such as " (>= 2.34)"
+_VERSION_CONSTRAINT_RE = re.compile(r"\s*\(.*?\)")
+
 
 @dataclass
 class Dependency:
@@ -122,37 +127,32 @@ class DependencyResolver:
             logger.warning(f"Could not get dependencies for {package_name}: {stderr}")
             return dependencies
 
-        current_dep_name = None
-        for line in stdout.split("\n"):
-            line = line.strip()
+        # One scan over the output instead of splitting and testing every line
+        for match in _APT_DEPENDS_RE.finditer(stdout):
+            kind, dep_name = match.group(1), match.group(2).strip()
 
-            # Parse dependency lines
-            if line.startswith("Depends:"):
-                current_dep_name = line.split(":", 1)[1].strip()
+            if kind == "Depends":
                 # Handle alternatives (package1 | package2)
-                if "|" in current_dep_name:
-                    current_dep_name = current_dep_name.split("|")[0].strip()
+                if "|" in dep_name:
+                    dep_name = dep_name.split("|")[0].strip()
 
                 # Remove version constraints
-                current_dep_name = re.sub(r"\s*\(.*?\)", "", current_dep_name)
+                dep_name = _VERSION_CONSTRAINT_RE.sub("", dep_name)
 
-                is_installed = self.is_package_installed(current_dep_name)
-                installed_ver = (
-                    self.get_installed_version(current_dep_name) if is_installed else None
-                )
+                is_installed = self.is_package_installed(dep_name)
+                installed_ver = self.get_installed_version(dep_name) if is_installed else None
 
                 dependencies.append(
                     Dependency(
-                        name=current_dep_name,
+                        name=dep_name,
                         reason="Required dependency",
                         is_satisfied=is_installed,
                         installed_version=installed_ver,
                     )
                 )
 
-            elif line.startswith("Recommends:"):
-                dep_name = line.split(":", 1)[1].strip()
-                dep_name = re.sub(r"\s*\(.*?\)", "", dep_name)
+            else:
+                dep_name = _VERSION_CONSTRAINT_RE.sub("", dep_name)
 
                 dependencies.append(
                     Dependency(
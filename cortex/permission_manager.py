@@ -69,19 +69,29 @@ class PermissionManager:
             List[str]: A list of full file paths requiring ownership reclamation.
         """
         mismatched_files = []
-        for root, dirs, files in os.walk(self.base_path):
-            # Prune excluded directories in-place to optimize the recursive walk.
-            dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS]
-
-            for name in files:
-                full_path = os.path.join(root, name)
-                try:
-                    # Capture files owned by root or mismatched container UIDs.
-                    if os.stat(full_path).st_uid != self.host_uid:
-                        mismatched_files.append(full_path)
-                except (PermissionError, FileNotFoundError):
-                    # Skip files that are inaccessible or moved during the scan.
-                    continue
+        # Walk with os.scandir directly: DirEntry carries the file type from
+        # readdir and its path is prebuilt, so no per-file os.path.join is needed.
+        pending = [self.base_path]
+        while pending:
+            try:
+                entries = os.scandir(pending.pop())
+            except (PermissionError, FileNotFoundError):
+                continue
+
+            with entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            # Prune excluded directories and, like os.walk, do not
+                            # descend into symlinked directories.
+                            if entry.name not in EXCLUDED_DIRS and not entry.is_symlink():
+                                pending.append(entry.path)
+                        # Capture files owned by root or mismatched container UIDs.
+                        elif entry.stat().st_uid != self.host_uid:
+                            mismatched_files.append(entry.path)
+                    except (PermissionError, FileNotFoundError):
+                        # Skip files that are inaccessible or moved during the scan.
+                        continue
         return mismatched_files
 
     def generate_compose_settings(self) -> str:
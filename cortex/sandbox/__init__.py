@@ -10,6 +10,7 @@ Provides sandboxed execution environments for safe package testing.
 from cortex.sandbox.docker_sandbox import (
     DockerNotFoundError,
     DockerSandbox,
+    InvalidSandboxNameError,
     SandboxAlreadyExistsError,
     SandboxExecutionResult,
     SandboxInfo,
@@ -29,6 +30,7 @@ __all__ = [
     # Docker sandbox
     "DockerNotFoundError",
     "DockerSandbox",
+    "InvalidSandboxNameError",
     "SandboxAlreadyExistsError",
     "SandboxExecutionResult",
     "SandboxInfo",
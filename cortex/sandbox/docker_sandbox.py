@@ -14,13 +14,17 @@ Features:
 - Automatic cleanup
 """
 
+import asyncio
+import concurrent.futures
 import json
 import logging
 import os
+import re
 import shutil
 import subprocess
 import time
-from dataclasses import dataclass, field
+from collections.abc import Iterator
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
@@ -38,6 +42,57 @@ class SandboxState(Enum):
     DESTROYED = "destroyed"
 
 
+# Valid sandbox names: Docker's container name rule. Names are also used in
+# hostnames and metadata file names; "/" is excluded and the leading
+# alphanumeric rules out "." and ".." style names, so none can escape data_dir.
+_SANDBOX_NAME_RE = re.compile(r"\A[A-Za-z0-9][A-Za-z0-9_.-]*\Z")
+
+
+def _invalid_name_message(name: str) -> str:
+    """Explain why a sandbox name was rejected."""
+    return (
+        f"Invalid sandbox name '{name}': use letters, digits, '.', '-' or '_', "
+        "starting with a letter or digit"
+    )
+
+
+# Value -> member lookup for deserialization (avoids Enum.__call__ per load)
+_STATE_BY_VALUE = {state.value: state for state in SandboxState}
+
+# Flags tried, in order, to check that an installed package runs
+_VERSION_FLAGS = ("--version", "-v", "--help")
+
+# Line printed before each functional probe attempt to delimit its output
+_PROBE_MARKER = "__cortex_probe__"
+
+# Seconds each version flag may run before the probe moves on to the next one
+_PROBE_FLAG_TIMEOUT = 10
+
+
+def _build_probe_script(flag_timeout: int) -> str:
+    """
+    Build the functional probe, run as `sh -c <script> sh <package>`.
+
+    The package is passed as $1, so the script is built once instead of
+    formatted per package. Each flag attempt gets its own time limit via
+    timeout(1) when the image has it, so a hanging --version still lets
+    -v and --help be tried.
+    """
+    attempts = " || ".join(
+        f'{{ echo {_PROBE_MARKER}; t "$1" {flag} && echo {_PROBE_MARKER}{i}; }}'
+        for i, flag in enumerate(_VERSION_FLAGS)
+    )
+    return (
+        "if command -v timeout >/dev/null 2>&1; "
+        f'then t() {{ timeout -s KILL {flag_timeout} "$@"; }}; '
+        'else t() { "$@"; }; fi; ' + attempts
+    )
+
+
+_PROBE_SCRIPT = _build_probe_script(_PROBE_FLAG_TIMEOUT)
+_PROBE_RESULT_RE = re.compile(rf"(.*?)\n?{_PROBE_MARKER}(\d+)\s*", re.DOTALL)
+
+
 class SandboxTestStatus(Enum):
     """Result of a sandbox test."""
 
@@ -46,7 +101,7 @@ class SandboxTestStatus(Enum):
     SKIPPED = "skipped"
 
 
-@dataclass
+@dataclass(slots=True)
 class SandboxTestResult:
     """Result of a single test in sandbox."""
 
@@ -56,7 +111,7 @@ class SandboxTestResult:
     duration: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class SandboxInfo:
     """Information about a sandbox environment."""
 
@@ -78,20 +133,31 @@ class SandboxInfo:
             "packages": self.packages,
         }
 
+    def to_json(self) -> str:
+        """Serialize to a compact JSON string."""
+        # One-shot, unindented dumps() goes through the C encoder; dump() and
+        # indent= fall back to the pure-Python iterencode.
+        return json.dumps(self.to_dict())
+
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "SandboxInfo":
         """Create from dictionary."""
         return cls(
             name=data["name"],
             container_id=data["container_id"],
-            state=SandboxState(data["state"]),
+            state=_STATE_BY_VALUE[data["state"]],
             created_at=data["created_at"],
             image=data["image"],
             packages=data.get("packages", []),
         )
 
 
-@dataclass
+def _copy_info(info: SandboxInfo) -> SandboxInfo:
+    """Copy a SandboxInfo so the metadata cache never shares its mutable fields."""
+    return replace(info, packages=list(info.packages))
+
+
+@dataclass(slots=True)
 class SandboxExecutionResult:
     """Result of sandbox operation."""
 
@@ -116,6 +182,12 @@ class SandboxNotFoundError(Exception):
     pass
 
 
+class InvalidSandboxNameError(SandboxNotFoundError):
+    """Raised when a sandbox name is not a valid (and so cannot exist) sandbox name."""
+
+    pass
+
+
 class SandboxAlreadyExistsError(Exception):
     """Raised when trying to create a sandbox that already exists."""
 
@@ -145,6 +217,9 @@ class DockerSandbox:
     # Container name prefix
     CONTAINER_PREFIX = "cortex-sandbox-"
 
+    # Upper bound on packages tested concurrently by test()
+    MAX_TEST_WORKERS = 4
+
     # Commands that cannot run in Docker sandbox
     SANDBOX_BLOCKED_COMMANDS = {
         "systemctl",
@@ -182,6 +257,13 @@ class DockerSandbox:
         self.default_image = image or self.DEFAULT_IMAGE
         self._docker_path: str | None = None
 
+        # In-process metadata cache, kept in sync by _save/_delete_metadata
+        self._metadata_cache: dict[str, SandboxInfo] = {}
+
+        # Per-package test results keyed by (sandbox, package); dropped whenever
+        # the sandbox container may have changed
+        self._test_cache: dict[tuple[str, str], list[SandboxTestResult]] = {}
+
         # Ensure data directory exists
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
@@ -189,9 +271,15 @@ class DockerSandbox:
         """
         Check if Docker is installed and running.
 
+        A successful check is cached for the lifetime of this instance and
+        shared with require_docker(); failed checks are retried on each call.
+
         Returns:
             True if Docker is available and running, False otherwise.
         """
+        if self._docker_path:
+            return True
+
         docker_path = shutil.which("docker")
         if not docker_path:
             return False
@@ -214,7 +302,11 @@ class DockerSandbox:
                 text=True,
                 timeout=10,
             )
-            return result.returncode == 0
+            if result.returncode != 0:
+                return False
+
+            self._docker_path = docker_path
+            return True
 
         except (subprocess.TimeoutExpired, FileNotFoundError, OSError) as e:
             logger.debug(f"Docker check failed: {e}")
@@ -265,33 +357,67 @@ class DockerSandbox:
         return f"{self.CONTAINER_PREFIX}{sandbox_name}"
 
     def _get_metadata_path(self, sandbox_name: str) -> Path:
-        """Get path to sandbox metadata file."""
+        """
+        Get path to sandbox metadata file.
+
+        Every metadata read, write and delete goes through here, so names
+        that could resolve outside data_dir are rejected for all entry points.
+
+        Raises:
+            InvalidSandboxNameError: If the name is not a valid sandbox name
+        """
+        if not _SANDBOX_NAME_RE.match(sandbox_name):
+            raise InvalidSandboxNameError(_invalid_name_message(sandbox_name))
         return self.data_dir / f"{sandbox_name}.json"
 
     def _save_metadata(self, info: SandboxInfo) -> None:
         """Save sandbox metadata to disk."""
         metadata_path = self._get_metadata_path(info.name)
-        with open(metadata_path, "w") as f:
-            json.dump(info.to_dict(), f, indent=2)
+        metadata_path.write_text(info.to_json())
+        # Cached only once written, and as a copy, so it always matches disk
+        self._metadata_cache[info.name] = _copy_info(info)
 
     def _load_metadata(self, sandbox_name: str) -> SandboxInfo | None:
-        """Load sandbox metadata from disk."""
+        """
+        Load sandbox metadata, reading from disk only on a cache miss.
+
+        Metadata written by another process after the first load is not
+        picked up by this instance.
+        """
+        cached = self._metadata_cache.get(sandbox_name)
+        if cached is not None:
+            # Callers may modify what they get; the cache keeps its own copy
+            return _copy_info(cached)
+
         metadata_path = self._get_metadata_path(sandbox_name)
         if not metadata_path.exists():
             return None
         try:
             with open(metadata_path) as f:
-                return SandboxInfo.from_dict(json.load(f))
+                info = SandboxInfo.from_dict(json.load(f))
         except (json.JSONDecodeError, KeyError) as e:
             logger.warning(f"Failed to load sandbox metadata: {e}")
             return None
+        self._metadata_cache[sandbox_name] = _copy_info(info)
+        return info
 
     def _delete_metadata(self, sandbox_name: str) -> None:
         """Delete sandbox metadata from disk."""
+        self._metadata_cache.pop(sandbox_name, None)
         metadata_path = self._get_metadata_path(sandbox_name)
         if metadata_path.exists():
             metadata_path.unlink()
 
+    def invalidate_test_cache(self, sandbox_name: str) -> None:
+        """
+        Forget cached test results for a sandbox.
+
+        Args:
+            sandbox_name: Sandbox whose container state has changed
+        """
+        for key in [key for key in self._test_cache if key[0] == sandbox_name]:
+            del self._test_cache[key]
+
     def _run_docker(
         self,
         args: list[str],
@@ -322,6 +448,14 @@ class DockerSandbox:
             check=check,
         )
 
+    def _image_available(self, image: str) -> bool:
+        """Check whether a Docker image is present in the local image store."""
+        try:
+            result = self._run_docker(["image", "inspect", image], timeout=30, check=False)
+        except subprocess.TimeoutExpired:
+            return False
+        return result.returncode == 0
+
     def create(
         self,
         name: str,
@@ -341,6 +475,13 @@ class DockerSandbox:
             SandboxAlreadyExistsError: If sandbox with name already exists
             DockerNotFoundError: If Docker is not available
         """
+        if not _SANDBOX_NAME_RE.match(name):
+            return SandboxExecutionResult(
+                success=False,
+                message=_invalid_name_message(name),
+                exit_code=1,
+            )
+
         self.require_docker()
 
         # Check if sandbox already exists
@@ -352,9 +493,11 @@ class DockerSandbox:
         image = image or self.default_image
 
         try:
-            # Pull image if needed
-            logger.info(f"Pulling image {image}...")
-            self._run_docker(["pull", image], timeout=300, check=False)
+            # Pull image only if it is not already available locally; a registry
+            # round-trip dominates create() time when the image is cached.
+            if not self._image_available(image):
+                logger.info(f"Pulling image {image}...")
+                self._run_docker(["pull", image], timeout=300, check=False)
 
             # Create and start container
             logger.info(f"Creating container {container_name}...")
@@ -389,11 +532,12 @@ class DockerSandbox:
                 name=name,
                 container_id=container_id,
                 state=SandboxState.RUNNING,
-                created_at=datetime.now().isoformat(),
+                created_at=datetime.now().isoformat(timespec="seconds"),
                 image=image,
                 packages=[],
             )
             self._save_metadata(info)
+            self.invalidate_test_cache(name)
 
             return SandboxExecutionResult(
                 success=True,
@@ -446,6 +590,8 @@ class DockerSandbox:
             # Install package
             apt_cmd = ["apt-get", "install", "-y", "-qq"] + options + [package]
 
+            # Even a failed install may leave the container's packages changed
+            self.invalidate_test_cache(name)
             result = self._run_docker(
                 ["exec", container_name] + apt_cmd,
                 timeout=300,
@@ -455,8 +601,7 @@ class DockerSandbox:
             if result.returncode == 0:
                 # Update metadata with installed package
                 if package not in info.packages:
-                    info.packages.append(package)
-                    self._save_metadata(info)
+                    self._save_metadata(replace(info, packages=[*info.packages, package]))
 
                 return SandboxExecutionResult(
                     success=True,
@@ -515,162 +660,280 @@ class DockerSandbox:
                 test_results=[],
             )
 
-        test_results: list[SandboxTestResult] = []
-        all_passed = True
+        # Reuse results for packages already tested since the container last changed
+        untested = [pkg for pkg in packages_to_test if (name, pkg) not in self._test_cache]
+        unhealthy: dict[str, list[SandboxTestResult]] = {}
 
-        for pkg in packages_to_test:
-            # Test 1: Check if package binary exists
-            start_time = time.time()
-            try:
-                result = self._run_docker(
-                    ["exec", container_name, "which", pkg],
-                    timeout=10,
-                    check=False,
+        if untested:
+            # Test 3: Check for conflicts (dpkg errors). The audit covers the
+            # whole package database, so it runs once, and first: if dpkg
+            # itself cannot run, every per-package probe would fail as well.
+            start_ns = time.perf_counter_ns()
+            audit = self._run_docker(
+                ["exec", container_name, "dpkg", "--audit"],
+                timeout=30,
+                check=False,
+            )
+            audit_duration = (time.perf_counter_ns() - start_ns) / 1e9
+
+            if audit.returncode != 0 and not audit.stdout.strip():
+                reason = audit.stderr.strip()[:200] or f"dpkg --audit exited {audit.returncode}"
+                unhealthy = {
+                    pkg: [
+                        SandboxTestResult(
+                            name=f"{pkg}: conflict check",
+                            result=SandboxTestStatus.FAILED,
+                            message=f"Environment unhealthy: {reason}; package probes not run",
+                            duration=audit_duration,
+                        )
+                    ]
+                    for pkg in untested
+                }
+            else:
+                self._probe_packages(name, container_name, untested, audit, audit_duration)
+
+        # An unhealthy environment is not cached, so the next run retries it
+        test_results = [
+            result
+            for pkg in packages_to_test
+            for result in unhealthy.get(pkg) or self._test_cache[(name, pkg)]
+        ]
+        all_passed = not any(t.result == SandboxTestStatus.FAILED for t in test_results)
+
+        return SandboxExecutionResult(
+            success=all_passed,
+            message="All tests passed" if all_passed else "Some tests failed",
+            test_results=test_results,
+        )
+
+    async def atest(
+        self,
+        name: str,
+        package: str | None = None,
+    ) -> SandboxExecutionResult:
+        """
+        Run test() without blocking the event loop.
+
+        The docker calls are blocking, so they run on the loop's default
+        executor; several sandboxes can be tested concurrently with
+        asyncio.gather().
+
+        Args:
+            name: Sandbox name
+            package: Specific package to test (if None, tests all installed)
+
+        Returns:
+            SandboxExecutionResult with test results
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.test, name, package)
+
+    def _probe_packages(
+        self,
+        name: str,
+        container_name: str,
+        packages: list[str],
+        audit: subprocess.CompletedProcess[str],
+        audit_duration: float,
+    ) -> None:
+        """
+        Run the per-package checks and cache each package's results.
+
+        Args:
+            name: Sandbox name, used as the cache key
+            container_name: Docker container to run the checks in
+            packages: Packages to test
+            audit: Completed `dpkg --audit` run, reported as each package's conflict check
+            audit_duration: Seconds the audit took
+        """
+        if len(packages) == 1:
+            fresh = [self._test_package(container_name, packages[0])]
+        else:
+            # Each probe is an independent `docker exec`, so packages are tested concurrently
+            workers = min(len(packages), self.MAX_TEST_WORKERS)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+                fresh = list(
+                    pool.map(lambda pkg: self._test_package(container_name, pkg), packages)
                 )
-                binary_exists = result.returncode == 0
-                binary_path = result.stdout.strip() if binary_exists else None
-            except subprocess.TimeoutExpired:
-                binary_exists = False
-                binary_path = None
 
-            if binary_exists:
-                test_results.append(
+        for pkg, results in zip(packages, fresh):
+            if audit.returncode == 0 and not audit.stdout.strip():
+                results.append(
                     SandboxTestResult(
-                        name=f"{pkg}: binary exists",
+                        name=f"{pkg}: no conflicts",
                         result=SandboxTestStatus.PASSED,
-                        message=f"Found at {binary_path}",
-                        duration=time.time() - start_time,
+                        message="No package conflicts detected",
+                        duration=audit_duration,
                     )
                 )
-            else:
-                # Binary might have different name - check if package is installed
-                result = self._run_docker(
-                    ["exec", container_name, "dpkg", "-s", pkg],
-                    timeout=10,
-                    check=False,
-                )
-                if result.returncode == 0:
-                    test_results.append(
-                        SandboxTestResult(
-                            name=f"{pkg}: package installed",
-                            result=SandboxTestStatus.PASSED,
-                            message="Package is installed (binary may have different name)",
-                            duration=time.time() - start_time,
-                        )
-                    )
-                else:
-                    test_results.append(
-                        SandboxTestResult(
-                            name=f"{pkg}: package check",
-                            result=SandboxTestStatus.FAILED,
-                            message="Package not found",
-                            duration=time.time() - start_time,
-                        )
-                    )
-                    all_passed = False
-
-            # Test 2: Try --version or --help
-            start_time = time.time()
-            version_checked = False
-
-            for version_flag in ["--version", "-v", "--help"]:
-                try:
-                    result = self._run_docker(
-                        ["exec", container_name, pkg, version_flag],
-                        timeout=10,
-                        check=False,
-                    )
-                    if result.returncode == 0:
-                        test_results.append(
-                            SandboxTestResult(
-                                name=f"{pkg}: functional ({version_flag})",
-                                result=SandboxTestStatus.PASSED,
-                                message=result.stdout[:100].strip(),
-                                duration=time.time() - start_time,
-                            )
-                        )
-                        version_checked = True
-                        break
-                except subprocess.TimeoutExpired:
-                    continue
-
-            if not version_checked and binary_exists:
-                test_results.append(
+            elif audit.stdout.strip():
+                results.append(
                     SandboxTestResult(
-                        name=f"{pkg}: functional check",
-                        result=SandboxTestStatus.SKIPPED,
-                        message="Could not verify with --version/--help",
-                        duration=time.time() - start_time,
+                        name=f"{pkg}: conflict check",
+                        result=SandboxTestStatus.FAILED,
+                        message=audit.stdout[:200],
+                        duration=audit_duration,
                     )
                 )
+            self._test_cache[(name, pkg)] = results
+
+    def _test_package(self, container_name: str, pkg: str) -> list[SandboxTestResult]:
+        """
+        Run the per-package sandbox checks (binary and functional probes).
 
-            # Test 3: Check for conflicts (dpkg errors)
-            start_time = time.time()
+        Args:
+            container_name: Docker container to run the checks in
+            pkg: Package to test
+
+        Returns:
+            List of SandboxTestResult for this package, in execution order
+        """
+        test_results: list[SandboxTestResult] = []
+
+        # Test 1: Check if package binary exists
+        start_ns = time.perf_counter_ns()
+        try:
             result = self._run_docker(
-                ["exec", container_name, "dpkg", "--audit"],
-                timeout=30,
+                ["exec", container_name, "which", pkg],
+                timeout=10,
                 check=False,
             )
-            if result.returncode == 0 and not result.stdout.strip():
+            binary_exists = result.returncode == 0
+            binary_path = result.stdout.strip() if binary_exists else None
+        except subprocess.TimeoutExpired:
+            binary_exists = False
+            binary_path = None
+
+        if binary_exists:
+            test_results.append(
+                SandboxTestResult(
+                    name=f"{pkg}: binary exists",
+                    result=SandboxTestStatus.PASSED,
+                    message=f"Found at {binary_path}",
+                    duration=(time.perf_counter_ns() - start_ns) / 1e9,
+                )
+            )
+        else:
+            # Binary might have different name - check if package is installed
+            result = self._run_docker(
+                ["exec", container_name, "dpkg", "-s", pkg],
+                timeout=10,
+                check=False,
+            )
+            if result.returncode == 0:
                 test_results.append(
                     SandboxTestResult(
-                        name=f"{pkg}: no conflicts",
+                        name=f"{pkg}: package installed",
                         result=SandboxTestStatus.PASSED,
-                        message="No package conflicts detected",
-                        duration=time.time() - start_time,
+                        message="Package is installed (binary may have different name)",
+                        duration=(time.perf_counter_ns() - start_ns) / 1e9,
                     )
                 )
-            elif result.stdout.strip():
+            else:
                 test_results.append(
                     SandboxTestResult(
-                        name=f"{pkg}: conflict check",
+                        name=f"{pkg}: package check",
                         result=SandboxTestStatus.FAILED,
-                        message=result.stdout[:200],
-                        duration=time.time() - start_time,
+                        message="Package not found",
+                        duration=(time.perf_counter_ns() - start_ns) / 1e9,
                     )
                 )
-                all_passed = False
 
-        return SandboxExecutionResult(
-            success=all_passed,
-            message="All tests passed" if all_passed else "Some tests failed",
-            test_results=test_results,
-        )
+        # Without a binary on PATH every version flag fails with "not found",
+        # so skip the functional probe rather than spend an exec confirming it
+        if not binary_exists:
+            return test_results
+
+        # Test 2: Try --version or --help. All flags go through one `sh -c`
+        # chain so a broken package costs one exec instead of one per flag;
+        # each attempt is time-limited inside the script, preceded by a marker
+        # line, and a success is tagged with the index of the flag that worked.
+        start_ns = time.perf_counter_ns()
+        version_checked = False
+
+        try:
+            result = self._run_docker(
+                ["exec", container_name, "sh", "-c", _PROBE_SCRIPT, "sh", pkg],
+                # Backstop for images without timeout(1); normally each
+                # attempt is already killed after _PROBE_FLAG_TIMEOUT seconds
+                timeout=_PROBE_FLAG_TIMEOUT * len(_VERSION_FLAGS) + 5,
+                check=False,
+            )
+            # Only the output of the last (successful) attempt is kept
+            match = _PROBE_RESULT_RE.fullmatch(result.stdout.rsplit(f"{_PROBE_MARKER}\n", 1)[-1])
+            if result.returncode == 0 and match:
+                version_flag = _VERSION_FLAGS[int(match.group(2))]
+                test_results.append(
+                    SandboxTestResult(
+                        name=f"{pkg}: functional ({version_flag})",
+                        result=SandboxTestStatus.PASSED,
+                        message=match.group(1)[:100].strip(),
+                        duration=(time.perf_counter_ns() - start_ns) / 1e9,
+                    )
+                )
+                version_checked = True
+        except subprocess.TimeoutExpired:
+            pass
+
+        if not version_checked:
+            test_results.append(
+                SandboxTestResult(
+                    name=f"{pkg}: functional check",
+                    result=SandboxTestStatus.SKIPPED,
+                    message="Could not verify with --version/--help",
+                    duration=(time.perf_counter_ns() - start_ns) / 1e9,
+                )
+            )
+
+        return test_results
 
     def promote(
         self,
         name: str,
-        package: str,
+        package: str | list[str],
         dry_run: bool = False,
     ) -> SandboxExecutionResult:
         """
-        Promote a tested package to the main system.
+        Promote tested packages to the main system.
 
         This performs a fresh install on the host system (NOT container export).
-        The sandbox is only used for validation.
+        The sandbox is only used for validation. Multiple packages are installed
+        with a single apt-get invocation so dependencies are resolved once.
 
         Args:
             name: Sandbox name (for validation)
-            package: Package to install on host
+            package: Package, or list of packages, to install on host
             dry_run: If True, show command without executing
 
         Returns:
             SandboxExecutionResult with promotion status
         """
-        # Verify sandbox exists and package was tested
+        # Verify sandbox exists and packages were tested
         info = self._load_metadata(name)
         if not info:
             raise SandboxNotFoundError(f"Sandbox '{name}' not found")
 
-        if package not in info.packages:
+        packages = [package] if isinstance(package, str) else list(package)
+        if not packages or not all(packages):
+            # A bare "apt-get install -y" on the host must never run
+            return SandboxExecutionResult(
+                success=False,
+                message="No package specified to promote",
+                exit_code=1,
+            )
+
+        missing = [pkg for pkg in packages if pkg not in info.packages]
+        if missing:
             return SandboxExecutionResult(
                 success=False,
-                message=f"Package '{package}' was not installed in sandbox '{name}'",
+                message=f"Package '{', '.join(missing)}' was not installed in sandbox '{name}'",
                 exit_code=1,
             )
 
+        label = ", ".join(packages)
+
         # Build the host install command
-        install_cmd = ["sudo", "apt-get", "install", "-y", package]
+        install_cmd = ["sudo", "apt-get", "install", "-y"] + packages
 
         if dry_run:
             return SandboxExecutionResult(
@@ -704,9 +967,9 @@ class DockerSandbox:
             if result.returncode == 0:
                 return SandboxExecutionResult(
                     success=True,
-                    message=f"Package '{package}' installed on main system",
+                    message=f"Package '{label}' installed on main system",
                     stdout=result.stdout,
-                    packages_installed=[package],
+                    packages_installed=packages,
                 )
             else:
                 # Provide a helpful hint when package cannot be located
@@ -720,7 +983,7 @@ class DockerSandbox:
 
                 return SandboxExecutionResult(
                     success=False,
-                    message=f"Failed to install '{package}' on main system{hint}",
+                    message=f"Failed to install '{label}' on main system{hint}",
                     exit_code=result.returncode,
                     stderr=result.stderr,
                 )
@@ -770,6 +1033,7 @@ class DockerSandbox:
 
             # Delete metadata (if exists)
             self._delete_metadata(name)
+            self.invalidate_test_cache(name)
 
             return SandboxExecutionResult(
                 success=True,
@@ -783,24 +1047,31 @@ class DockerSandbox:
                 exit_code=1,
             )
 
-    def list_sandboxes(self) -> list[SandboxInfo]:
+    def iter_sandboxes(self) -> Iterator[SandboxInfo]:
         """
-        List all sandbox environments.
+        Iterate over sandbox environments, loading metadata lazily.
 
-        Returns:
-            List of SandboxInfo objects
+        Yields:
+            SandboxInfo objects, one per readable metadata file
         """
-        sandboxes = []
-
         for metadata_file in self.data_dir.glob("*.json"):
             try:
                 with open(metadata_file) as f:
-                    data = json.load(f)
-                    sandboxes.append(SandboxInfo.from_dict(data))
+                    info = SandboxInfo.from_dict(json.load(f))
             except (json.JSONDecodeError, KeyError) as e:
                 logger.warning(f"Failed to load {metadata_file}: {e}")
+                continue
+            self._metadata_cache[info.name] = _copy_info(info)
+            yield info
 
-        return sandboxes
+    def list_sandboxes(self) -> list[SandboxInfo]:
+        """
+        List all sandbox environments.
+
+        Returns:
+            List of SandboxInfo objects
+        """
+        return list(self.iter_sandboxes())
 
     def get_sandbox(self, name: str) -> SandboxInfo | None:
         """
@@ -812,7 +1083,10 @@ class DockerSandbox:
         Returns:
             SandboxInfo or None if not found
         """
-        return self._load_metadata(name)
+        try:
+            return self._load_metadata(name)
+        except InvalidSandboxNameError:
+            return None
 
     def exec_command(
         self,
@@ -847,6 +1121,7 @@ class DockerSandbox:
             )
 
         container_name = self._get_container_name(name)
+        self.invalidate_test_cache(name)
 
         try:
             result = self._run_docker(
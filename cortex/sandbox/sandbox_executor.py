@@ -12,14 +12,20 @@ Features:
 - Comprehensive logging
 """
 
+import asyncio
+import functools
+import itertools
 import json
 import logging
+import logging.handlers
 import os
+import queue
 import re
 import shlex
 import shutil
 import subprocess
 import sys
+import threading
 import time
 
 try:
@@ -29,7 +35,7 @@ except ImportError:  # pragma: no cover
 from datetime import datetime
 from typing import Any
 
-from cortex.validators import DANGEROUS_PATTERNS
+from cortex.validators import DANGEROUS_PATTERNS, has_dangerous_pattern
 
 try:
     import resource  # type: ignore
@@ -40,6 +46,169 @@ except ImportError:  # pragma: no cover
     HAS_RESOURCE = False
 
 
+def _truncate_output(text: str, limit: int) -> str:
+    """Cut captured output to limit characters, noting how much was dropped."""
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}\n[TRUNCATED] {len(text) - limit} more characters"
+
+
+@functools.lru_cache(maxsize=1024)
+def _tokenize(command: str) -> tuple[str, ...]:
+    """shlex.split a command, memoised since the same commands recur."""
+    return tuple(shlex.split(command))
+
+
+@functools.lru_cache(maxsize=16)
+def _firejail_options(firejail_path: str, cpu_cores: int, memory_bytes: int) -> tuple[str, ...]:
+    """Build the firejail argv prefix with security options and resource limits."""
+    return (
+        firejail_path,
+        "--quiet",  # Suppress firejail messages
+        "--noprofile",  # Don't use default profile
+        "--private",  # Private home directory
+        "--private-tmp",  # Private /tmp
+        f"--cpu={cpu_cores}",  # CPU limit
+        f"--rlimit-as={memory_bytes}",  # Memory limit (address space)
+        "--net=none",  # No network (adjust if needed)
+        "--noroot",  # No root access
+        "--caps.drop=all",  # Drop all capabilities
+        "--shell=none",  # No shell
+        "--seccomp",  # Enable seccomp filtering
+    )
+
+
+# Firejail binary once found on PATH, shared by all executors. Misses are not
+# cached, so installing firejail mid-process (as the missing-firejail warning
+# suggests) is picked up by the next executor.
+_firejail_path: str | None = None
+
+
+def _which_firejail() -> str | None:
+    """Look up firejail, walking PATH again only until it has been found."""
+    global _firejail_path
+    # One access() check replaces the PATH walk and notices an uninstall
+    if _firejail_path is None or not os.access(_firejail_path, os.X_OK):
+        _firejail_path = shutil.which("firejail")
+    return _firejail_path
+
+
+class _BufferedFileHandler(logging.FileHandler):
+    """
+    File handler that writes audit records in batches.
+
+    Formatted records are held in memory and written with a single write()
+    once capacity records are pending, the oldest has waited flush_interval
+    seconds, a record at flush_level or above arrives, or the handler is
+    flushed or closed. The audit writer flushes it whenever its queue runs
+    dry, so records only wait while more are arriving.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        capacity: int = 128,
+        flush_level: int = logging.WARNING,
+        flush_interval: float = 0.5,
+    ):
+        super().__init__(filename)
+        self.capacity = capacity
+        self.flush_level = flush_level
+        self.flush_interval = flush_interval
+        self._pending: list[str] = []
+        self._pending_since = 0.0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            now = time.monotonic()
+            if not self._pending:
+                self._pending_since = now
+            self._pending.append(self.format(record) + self.terminator)
+            if (
+                len(self._pending) >= self.capacity
+                or record.levelno >= self.flush_level
+                or now - self._pending_since >= self.flush_interval
+            ):
+                self._write_pending()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        try:
+            self._write_pending()
+        except Exception:
+            self.handleError(logging.makeLogRecord({"msg": "Failed to flush audit log"}))
+
+    def _write_pending(self) -> None:
+        # Like FileHandler, write errors must reach handleError, not the caller
+        with self.lock:
+            pending, self._pending = self._pending, []
+            if pending:
+                if self.stream is None:
+                    self.stream = self._open()
+                self.stream.write("".join(pending))
+            super().flush()
+
+
+class _AuditQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener that flushes its handlers whenever the queue runs dry.
+
+    Buffering handlers then batch records only while more are waiting, and
+    an idle executor has everything on disk. A handler error is reported via
+    handleError instead of ending the writer thread.
+    """
+
+    def handle(self, record: logging.LogRecord) -> None:
+        record = self.prepare(record)
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                try:
+                    handler.handle(record)
+                except Exception:
+                    handler.handleError(record)
+        if self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+
+
+class _AuditQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that hands audit records to a background writer thread.
+
+    An _AuditQueueListener owns the target handler, so execute() does not
+    wait on disk I/O. flush() and close() use QueueListener.stop(), which
+    returns once every queued record has been handled; flush() then starts
+    the listener again. logging.shutdown() flushes and closes the handler
+    at interpreter exit.
+    """
+
+    def __init__(self, target: logging.Handler):
+        super().__init__(queue.SimpleQueue())
+        self._listener = _AuditQueueListener(self.queue, target)
+        self._listener_lock = threading.Lock()
+        self._listener.start()
+        self._running = True
+
+    def flush(self) -> None:
+        with self._listener_lock:
+            if not self._running:
+                return
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.flush()
+            self._listener.start()
+
+    def close(self) -> None:
+        with self._listener_lock:
+            if self._running:
+                self._running = False
+                self._listener.stop()
+                for handler in self._listener.handlers:
+                    handler.close()
+        super().close()
+
+
 class CommandBlocked(Exception):
     """Raised when a command is blocked."""
 
@@ -49,6 +218,18 @@ class CommandBlocked(Exception):
 class ExecutionResult:
     """Result of command execution."""
 
+    __slots__ = (
+        "command",
+        "exit_code",
+        "stdout",
+        "stderr",
+        "execution_time",
+        "blocked",
+        "violation",
+        "preview",
+        "timestamp",
+    )
+
     def __init__(
         self,
         command: str,
@@ -167,6 +348,22 @@ class SandboxExecutor:
         os.path.expanduser("~"),
     ]
 
+    # Critical system directories that commands may not touch
+    CRITICAL_DIRECTORIES = (
+        "/boot",
+        "/sys",
+        "/proc",
+        "/dev",
+        "/etc",
+        "/usr/bin",
+        "/usr/sbin",
+        "/sbin",
+        "/bin",
+    )
+
+    # Characters of stdout/stderr kept per result (and so per audit log entry)
+    MAX_OUTPUT_CHARS = 64 * 1024
+
     def __init__(
         self,
         firejail_path: str | None = None,
@@ -196,6 +393,9 @@ class SandboxExecutor:
         self.timeout_seconds = timeout_seconds
         self.enable_rollback = enable_rollback
 
+        # Expanded once; _validate_paths checks every path against these
+        self._allowed_directories = tuple(os.path.expanduser(d) for d in self.ALLOWED_DIRECTORIES)
+
         # Setup logging
         self.log_file = log_file or os.path.join(
             os.path.expanduser("~"), ".cortex", "sandbox_audit.log"
@@ -205,6 +405,7 @@ class SandboxExecutor:
         # Rollback tracking
         self.rollback_snapshots: dict[str, dict[str, Any]] = {}
         self.current_session_id: str | None = None
+        self._session_counter = itertools.count(1)
 
         # Audit log
         self.audit_log: list[dict[str, Any]] = []
@@ -216,10 +417,19 @@ class SandboxExecutor:
                 "Install firejail for full security: sudo apt-get install firejail"
             )
 
+    @property
+    def max_memory_bytes(self) -> int:
+        """Memory limit in bytes."""
+        return self.max_memory_mb * 1024 * 1024
+
+    @property
+    def max_disk_bytes(self) -> int:
+        """Disk (file size) limit in bytes."""
+        return self.max_disk_mb * 1024 * 1024
+
     def _find_firejail(self) -> str | None:
         """Find firejail binary in system PATH."""
-        firejail_path = shutil.which("firejail")
-        return firejail_path
+        return _which_firejail()
 
     def is_firejail_available(self) -> bool:
         """
@@ -241,11 +451,16 @@ class SandboxExecutor:
         self.logger = logging.getLogger("SandboxExecutor")
         self.logger.setLevel(logging.INFO)
 
-        # Clear existing handlers to avoid duplicates
+        # Close and clear existing handlers to avoid duplicates; closing
+        # writes out anything a previous executor still had buffered
+        for handler in self.logger.handlers:
+            handler.close()
         self.logger.handlers.clear()
 
-        # File handler
-        file_handler = logging.FileHandler(self.log_file)
+        # File handler, batched so each execution does not cost a write syscall
+        # and driven from a writer thread so execute() does not block on it.
+        # Batches go to disk whenever the writer catches up with the queue.
+        file_handler = _BufferedFileHandler(self.log_file)
         file_handler.setLevel(logging.INFO)
 
         # Console handler (only warnings and above)
@@ -257,12 +472,20 @@ class SandboxExecutor:
         file_handler.setFormatter(formatter)
         console_handler.setFormatter(formatter)
 
-        self.logger.addHandler(file_handler)
+        audit_handler = _AuditQueueHandler(file_handler)
+        audit_handler.setLevel(logging.INFO)
+
+        self.logger.addHandler(audit_handler)
         self.logger.addHandler(console_handler)
 
         # Prevent propagation to root logger
         self.logger.propagate = False
 
+    def flush_audit_log(self) -> None:
+        """Write any buffered audit log records to the log file."""
+        for handler in self.logger.handlers:
+            handler.flush()
+
     def validate_command(self, command: str) -> tuple[bool, str | None]:
         """
         Validate command for security.
@@ -273,14 +496,16 @@ class SandboxExecutor:
         Returns:
             Tuple of (is_valid, violation_reason)
         """
-        # Check for dangerous patterns
-        for pattern in DANGEROUS_PATTERNS:
-            if re.search(pattern, command, re.IGNORECASE):
-                return False, f"Dangerous pattern detected: {pattern}"
+        # Check for dangerous patterns; only on a hit is each pattern tried, to
+        # report the first one that matches
+        if has_dangerous_pattern(command):
+            for pattern in DANGEROUS_PATTERNS:
+                if re.search(pattern, command, re.IGNORECASE):
+                    return False, f"Dangerous pattern detected: {pattern}"
 
         # Parse command
         try:
-            parts = shlex.split(command)
+            parts = _tokenize(command)
             if not parts:
                 return False, "Empty command"
 
@@ -338,18 +563,7 @@ class SandboxExecutor:
                 continue
 
             # Block access to critical system directories
-            critical_dirs = [
-                "/boot",
-                "/sys",
-                "/proc",
-                "/dev",
-                "/etc",
-                "/usr/bin",
-                "/usr/sbin",
-                "/sbin",
-                "/bin",
-            ]
-            for critical in critical_dirs:
+            for critical in self.CRITICAL_DIRECTORIES:
                 if abs_path.startswith(critical):
                     # Allow /dev/null for redirection
                     if abs_path == "/dev/null":
@@ -360,17 +574,10 @@ class SandboxExecutor:
                     return f"Access to critical directory blocked: {abs_path}"
 
             # Block path traversal attempts
-            if (
-                ".." in path
-                or path.startswith("/")
-                and not any(
-                    abs_path.startswith(os.path.expanduser(d)) for d in self.ALLOWED_DIRECTORIES
-                )
-            ):
+            in_allowed_dir = abs_path.startswith(self._allowed_directories)
+            if ".." in path or path.startswith("/") and not in_allowed_dir:
                 # Allow if it's a command argument (like --config=/etc/file.conf)
-                if not any(
-                    abs_path.startswith(os.path.expanduser(d)) for d in self.ALLOWED_DIRECTORIES
-                ):
+                if not in_allowed_dir:
                     # More permissive: only block if clearly dangerous
                     if any(
                         danger in abs_path
@@ -395,27 +602,16 @@ class SandboxExecutor:
         """
         if not self.firejail_path:
             # Fallback to direct execution (not recommended)
-            return shlex.split(command)
-
-        # Build firejail command with security options
-        memory_bytes = self.max_memory_mb * 1024 * 1024
-        firejail_cmd = [
-            self.firejail_path,
-            "--quiet",  # Suppress firejail messages
-            "--noprofile",  # Don't use default profile
-            "--private",  # Private home directory
-            "--private-tmp",  # Private /tmp
-            f"--cpu={self.max_cpu_cores}",  # CPU limit
-            f"--rlimit-as={memory_bytes}",  # Memory limit (address space)
-            "--net=none",  # No network (adjust if needed)
-            "--noroot",  # No root access
-            "--caps.drop=all",  # Drop all capabilities
-            "--shell=none",  # No shell
-            "--seccomp",  # Enable seccomp filtering
-        ]
+            return list(_tokenize(command))
+
+        # Security options depend only on the executor's limits, so their
+        # argv prefix is built once per configuration
+        firejail_cmd = list(
+            _firejail_options(self.firejail_path, self.max_cpu_cores, self.max_memory_bytes)
+        )
 
         # Add command
-        firejail_cmd.extend(shlex.split(command))
+        firejail_cmd.extend(_tokenize(command))
 
         return firejail_cmd
 
@@ -437,18 +633,12 @@ class SandboxExecutor:
             "file_backups": {},  # Store file contents for restoration
         }
 
-        # Track files in allowed directories that might be modified
-        # Store their current state for potential rollback
-        for allowed_dir in self.ALLOWED_DIRECTORIES:
-            allowed_expanded = os.path.expanduser(allowed_dir)
-            if os.path.exists(allowed_expanded):
-                # Note: Full file tracking would require inotify or filesystem monitoring
-                # For now, we track the directory state
-                try:
-                    snapshot["directories_tracked"] = snapshot.get("directories_tracked", [])
-                    snapshot["directories_tracked"].append(allowed_expanded)
-                except Exception:
-                    pass
+        # Track allowed directories that might be modified, reusing the paths
+        # expanded at init. Note: Full file tracking would require inotify or
+        # filesystem monitoring; for now, we track the directory state.
+        tracked = [d for d in self._allowed_directories if os.path.isdir(d)]
+        if tracked:
+            snapshot["directories_tracked"] = tracked
 
         self.rollback_snapshots[session_id] = snapshot
         self.logger.debug(f"Created snapshot for session {session_id}")
@@ -499,7 +689,11 @@ class SandboxExecutor:
         return True
 
     def execute(
-        self, command: str, dry_run: bool = False, enable_rollback: bool | None = None
+        self,
+        command: str,
+        dry_run: bool = False,
+        enable_rollback: bool | None = None,
+        max_output_chars: int | None = None,
     ) -> ExecutionResult:
         """
         Execute command in sandbox.
@@ -508,12 +702,16 @@ class SandboxExecutor:
             command: Command to execute
             dry_run: If True, only show what would execute
             enable_rollback: Override default rollback setting
+            max_output_chars: Keep at most this many characters of stdout and
+                stderr (defaults to MAX_OUTPUT_CHARS)
 
         Returns:
             ExecutionResult object
         """
-        start_time = time.time()
-        session_id = f"session_{int(start_time)}"
+        # Durations use the monotonic clock; wall-clock time only names the session
+        start_time = time.perf_counter()
+        # The counter keeps concurrent calls within one second apart
+        session_id = f"session_{int(time.time())}_{next(self._session_counter)}"
         self.current_session_id = session_id
 
         # Validate command
@@ -524,7 +722,7 @@ class SandboxExecutor:
                 exit_code=-1,
                 blocked=True,
                 violation=violation,
-                execution_time=time.time() - start_time,
+                execution_time=time.perf_counter() - start_time,
             )
             self._log_security_event(result)
             raise CommandBlocked(violation or "Command blocked")
@@ -543,7 +741,7 @@ class SandboxExecutor:
                 exit_code=0,
                 stdout=f"[DRY-RUN] Would execute: {preview}",
                 preview=preview,
-                execution_time=time.time() - start_time,
+                execution_time=time.perf_counter() - start_time,
             )
             self._log_execution(result)
             return result
@@ -558,6 +756,10 @@ class SandboxExecutor:
             # Set resource limits if not using Firejail
             preexec_fn = None
             if os.name != "nt" and not self.firejail_path and resource is not None:
+                # Computed in the parent so the forked child only calls setrlimit
+                memory_bytes = self.max_memory_bytes
+                cpu_seconds = self.timeout_seconds
+                disk_bytes = self.max_disk_bytes
 
                 def set_resource_limits():
                     """Set resource limits for the subprocess."""
@@ -565,16 +767,16 @@ class SandboxExecutor:
                         return
                     try:
                         # Memory limit (RSS - Resident Set Size)
-                        memory_bytes = self.max_memory_mb * 1024 * 1024
                         resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
                         # CPU time limit (soft and hard)
-                        cpu_seconds = self.timeout_seconds
                         resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
                         # File size limit
-                        disk_bytes = self.max_disk_mb * 1024 * 1024
                         resource.setrlimit(resource.RLIMIT_FSIZE, (disk_bytes, disk_bytes))
                     except (ValueError, OSError) as e:
-                        self.logger.warning(f"Failed to set resource limits: {e}")
+                        # Runs in the forked child before exec: logging here could
+                        # deadlock on locks held by parent threads, so report the
+                        # failure on the child's stderr, which lands in the result.
+                        os.write(2, f"Failed to set resource limits: {e}\n".encode())
 
                 preexec_fn = set_resource_limits
 
@@ -590,13 +792,15 @@ class SandboxExecutor:
             process = subprocess.Popen(firejail_cmd, **popen_kwargs)
             stdout, stderr = process.communicate(timeout=self.timeout_seconds)
             exit_code = process.returncode
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
 
+            # Bound what each result retains; the audit log keeps every result
+            limit = self.MAX_OUTPUT_CHARS if max_output_chars is None else max_output_chars
             result = ExecutionResult(
                 command=command,
                 exit_code=exit_code,
-                stdout=stdout,
-                stderr=stderr,
+                stdout=_truncate_output(stdout, limit),
+                stderr=_truncate_output(stderr, limit),
                 execution_time=execution_time,
             )
 
@@ -617,7 +821,7 @@ class SandboxExecutor:
                 command=command,
                 exit_code=-1,
                 stderr=f"Command timed out after {self.timeout_seconds} seconds",
-                execution_time=time.time() - start_time,
+                execution_time=time.perf_counter() - start_time,
             )
             self._log_execution(result)
             return result
@@ -627,11 +831,49 @@ class SandboxExecutor:
                 command=command,
                 exit_code=-1,
                 stderr=f"Execution error: {str(e)}",
-                execution_time=time.time() - start_time,
+                execution_time=time.perf_counter() - start_time,
             )
             self._log_execution(result)
             return result
 
+    async def aexecute(
+        self,
+        command: str,
+        dry_run: bool = False,
+        enable_rollback: bool | None = None,
+        max_output_chars: int | None = None,
+    ) -> ExecutionResult:
+        """
+        Execute command in sandbox without blocking the event loop.
+
+        Runs execute() on the loop's default executor, so several commands
+        can be awaited concurrently with asyncio.gather().
+
+        Args:
+            command: Command to execute
+            dry_run: If True, only show what would execute
+            enable_rollback: Override default rollback setting
+            max_output_chars: Keep at most this many characters of stdout and
+                stderr (defaults to MAX_OUTPUT_CHARS)
+
+        Returns:
+            ExecutionResult object
+
+        Raises:
+            CommandBlocked: If the command fails validation
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            functools.partial(
+                self.execute,
+                command,
+                dry_run=dry_run,
+                enable_rollback=enable_rollback,
+                max_output_chars=max_output_chars,
+            ),
+        )
+
     def _log_execution(self, result: ExecutionResult):
         """Log command execution to audit log."""
         log_entry = result.to_dict()
@@ -645,6 +887,8 @@ class SandboxExecutor:
         log_entry["type"] = "security_violation"
         self.audit_log.append(log_entry)
         self.logger.warning(f"Security violation: {result.command} - {result.violation}")
+        # Violations are on disk before CommandBlocked reaches the caller
+        self.flush_audit_log()
 
     def get_audit_log(self, limit: int | None = None) -> list[dict[str, Any]]:
         """
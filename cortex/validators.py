@@ -45,6 +45,43 @@ DANGEROUS_PATTERNS: list[str] = [
     r":\s*\(\)\s*\{\s*:\s*\|\s*:\s*&\s*\}",  # :(){ :|:& };:
 ]
 
+# All DANGEROUS_PATTERNS as one case-insensitive regex, so a safe command is
+# cleared in a single search instead of one search per pattern
+DANGEROUS_REGEX = re.compile("|".join(f"(?:{p})" for p in DANGEROUS_PATTERNS), re.IGNORECASE)
+
+# Lowercase literals of which every DANGEROUS_PATTERNS match contains at least
+# one. A command containing none of them cannot match, so the regex is skipped.
+# Add a trigger here when adding a pattern whose matches contain none of these;
+# triggers are plain text, never regex syntax ("&" covers the fork bomb).
+DANGEROUS_TRIGGERS: tuple[str, ...] = (
+    "rm",
+    "dd",
+    "mkfs",
+    "fdisk",
+    "parted",
+    "wipefs",
+    "format",
+    ">",
+    "chmod",
+    "chown",
+    "curl",
+    "wget",
+    "eval",
+    "python",
+    "base64",
+    "sudo",
+    "export",
+    "&",
+)
+
+
+def has_dangerous_pattern(command: str) -> bool:
+    """Return True if command matches any of DANGEROUS_PATTERNS."""
+    lowered = command.lower()
+    if not any(trigger in lowered for trigger in DANGEROUS_TRIGGERS):
+        return False
+    return DANGEROUS_REGEX.search(command) is not None
+
 
 class ValidationError(Exception):
     """Custom exception for validation errors with user-friendly messages"""
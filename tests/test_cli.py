@@ -230,6 +230,23 @@ class TestCortexCLI(unittest.TestCase):
         self.assertEqual(result, 0)
         mock_install.assert_called_once_with("docker", execute=False, dry_run=True, parallel=False)
 
+    @patch("sys.argv", ["cortex", "sandbox", "promote", "test-env", "nginx", "redis", "-y"])
+    @patch("cortex.sandbox.DockerSandbox")
+    def test_main_sandbox_promote_multiple_packages(self, mock_sandbox_cls):
+        mock_sandbox = mock_sandbox_cls.return_value
+        mock_sandbox.promote.return_value = Mock(success=True)
+        result = main()
+        self.assertEqual(result, 0)
+        mock_sandbox.promote.assert_called_once_with("test-env", ["nginx", "redis"], dry_run=False)
+
+    @patch("sys.argv", ["cortex", "sandbox", "promote", "test-env", "nginx", "redis", "--dry-run"])
+    @patch("cortex.sandbox.DockerSandbox")
+    def test_main_sandbox_promote_multiple_packages_dry_run(self, mock_sandbox_cls):
+        mock_sandbox = mock_sandbox_cls.return_value
+        result = main()
+        self.assertEqual(result, 0)
+        mock_sandbox.promote.assert_called_once_with("test-env", ["nginx", "redis"], dry_run=True)
+
     def test_spinner_animation(self):
         initial_idx = self.cli.spinner_idx
         self.cli._animate_spinner("Testing")
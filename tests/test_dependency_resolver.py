@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the dependency resolver's apt-cache output parsing.
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from cortex.dependency_resolver import DependencyResolver
+
+DPKG_LIST = """\
+Desired=Unknown/Install/Remove/Purge/Hold
+||/ Name           Version      Architecture Description
++++-==============-============-============-=================================
+ii  libc6:amd64    2.35-0ubuntu3 amd64       GNU C Library: Shared libraries
+ii  libc6          2.35-0ubuntu3 amd64       GNU C Library: Shared libraries
+ii  zlib1g         1:1.2.11      amd64       compression library - runtime
+"""
+
+APT_CACHE_DEPENDS = """\
+nginx
+  Depends: libc6 (>= 2.34)
+  Depends: nginx-core
+ |Depends: nginx-full
+  Depends: libssl3 | libssl1.1
+  Depends: zlib1g (>= 1:1.1.4)\r
+
+  Recommends: nginx-doc (= 1.18.0-6ubuntu14)
+  Suggests: fcgiwrap
+  Conflicts: nginx-light
+"""
+
+
+def fake_run_command(cmd: list[str]) -> tuple[bool, str, str]:
+    """Answer the commands DependencyResolver runs with canned output."""
+    if cmd[:2] == ["dpkg", "-l"]:
+        return True, DPKG_LIST, ""
+    if cmd[:2] == ["apt-cache", "depends"]:
+        return True, APT_CACHE_DEPENDS, ""
+    if cmd[0] == "dpkg-query":
+        return True, {"libc6": "2.35-0ubuntu3", "zlib1g": "1:1.2.11"}[cmd[-1]], ""
+    return False, "", "unexpected command"
+
+
+class TestGetAptDependencies(unittest.TestCase):
+    """Tests for DependencyResolver.get_apt_dependencies."""
+
+    def setUp(self) -> None:
+        patcher = patch.object(DependencyResolver, "_run_command", side_effect=fake_run_command)
+        self.mock_run = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.resolver = DependencyResolver()
+
+    def test_parses_depends_and_recommends(self) -> None:
+        """Test names, reasons and install state for each parsed line."""
+        deps = self.resolver.get_apt_dependencies("nginx")
+
+        self.assertEqual(
+            [(d.name, d.reason, d.is_satisfied, d.installed_version) for d in deps],
+            [
+                ("libc6", "Required dependency", True, "2.35-0ubuntu3"),
+                ("nginx-core", "Required dependency", False, None),
+                ("libssl3", "Required dependency", False, None),
+                ("zlib1g", "Required dependency", True, "1:1.2.11"),
+                ("nginx-doc", "Recommended package", False, None),
+            ],
+        )
+
+    def test_skips_alternative_and_other_lines(self) -> None:
+        """Test '|Depends:' alternatives, Suggests and Conflicts are not dependencies."""
+        names = [d.name for d in self.resolver.get_apt_dependencies("nginx")]
+
+        self.assertNotIn("nginx-full", names)
+        self.assertNotIn("libssl1.1", names)
+        self.assertNotIn("fcgiwrap", names)
+        self.assertNotIn("nginx-light", names)
+
+    def test_command_failure_returns_empty(self) -> None:
+        """Test a failing apt-cache yields no dependencies."""
+        self.mock_run.side_effect = lambda cmd: (False, "", "E: No packages found")
+
+        self.assertEqual(self.resolver.get_apt_dependencies("missing"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
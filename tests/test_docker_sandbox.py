@@ -8,21 +8,26 @@ Tests cover:
 - Edge cases and error conditions
 """
 
+import asyncio
 import json
 import os
-import shutil as shutil_module
+import shutil
+import subprocess
 import sys
 import tempfile
 import unittest
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 from unittest.mock import Mock, patch
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
+from cortex.sandbox import docker_sandbox
 from cortex.sandbox.docker_sandbox import (
     DockerNotFoundError,
     DockerSandbox,
+    InvalidSandboxNameError,
     SandboxAlreadyExistsError,
     SandboxInfo,
     SandboxNotFoundError,
@@ -31,6 +36,13 @@ from cortex.sandbox.docker_sandbox import (
     docker_available,
 )
 
+PROBE = docker_sandbox._PROBE_MARKER
+
+# Per-test metadata dirs live on tmpfs when available so setUp/tearDown
+# never touch backing storage; other platforms use the default temp dir.
+_SHM_DIR = "/dev/shm"
+TEMP_ROOT = _SHM_DIR if os.path.isdir(_SHM_DIR) and os.access(_SHM_DIR, os.W_OK) else None
+
 
 def create_sandbox_metadata(
     name: str = "test-env",
@@ -57,15 +69,13 @@ class SandboxTestBase(unittest.TestCase):
     """Base class for sandbox tests with common setup/teardown."""
 
     def setUp(self) -> None:
-        """Set up temp directory for sandbox metadata."""
-        self.temp_dir = tempfile.mkdtemp()
+        """Set up temp directory for sandbox metadata, removed on cleanup."""
+        temp_dir = tempfile.TemporaryDirectory(dir=TEMP_ROOT, ignore_cleanup_errors=True)
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
         self.data_dir = Path(self.temp_dir) / "sandboxes"
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
-    def tearDown(self) -> None:
-        """Clean up temp directory."""
-        shutil_module.rmtree(self.temp_dir, ignore_errors=True)
-
     def write_metadata(
         self,
         name: str = "test-env",
@@ -110,6 +120,20 @@ class TestDockerDetection(unittest.TestCase):
         mock_which.return_value, mock_run.return_value = mock_docker_available()
         self.assertTrue(DockerSandbox().check_docker())
 
+    @patch("shutil.which")
+    @patch("subprocess.run")
+    def test_docker_check_cached(self, mock_run: Mock, mock_which: Mock) -> None:
+        """Test a successful check is not repeated and is shared with require_docker."""
+        mock_which.return_value, mock_run.return_value = mock_docker_available()
+        sandbox = DockerSandbox()
+
+        self.assertTrue(sandbox.check_docker())
+        probes = mock_run.call_count
+        self.assertTrue(sandbox.check_docker())
+        self.assertEqual(sandbox.require_docker(), "/usr/bin/docker")
+
+        self.assertEqual(mock_run.call_count, probes)
+
     @patch("shutil.which")
     def test_require_docker_raises_when_not_found(self, mock_which: Mock) -> None:
         """Test require_docker raises DockerNotFoundError when not installed."""
@@ -146,6 +170,10 @@ class TestSandboxCreate(SandboxTestBase):
         self.assertTrue(result.success)
         self.assertIn("test-env", result.message)
         self.assertTrue((self.data_dir / "test-env.json").exists())
+        # Stored with second precision, e.g. 2024-01-01T00:00:00
+        info = self.create_sandbox_instance().get_sandbox("test-env")
+        self.assertEqual(datetime.fromisoformat(info.created_at).microsecond, 0)
+        self.assertNotIn(".", info.created_at)
 
     @patch("shutil.which")
     @patch("subprocess.run")
@@ -170,6 +198,75 @@ class TestSandboxCreate(SandboxTestBase):
 
         self.assertEqual(sandbox.get_sandbox("test-env").image, "debian:12")
 
+    @patch("shutil.which")
+    @patch("subprocess.run")
+    def test_create_skips_pull_for_local_image(self, mock_run: Mock, mock_which: Mock) -> None:
+        """Test no registry pull happens when the image is already present."""
+        mock_which.return_value, mock_run.return_value = mock_docker_available()
+
+        self.create_sandbox_instance().create("test-env")
+
+        commands = [c[0][0][1:] for c in mock_run.call_args_list]
+        self.assertIn(["image", "inspect", "ubuntu:22.04"], commands)
+        self.assertNotIn(["pull", "ubuntu:22.04"], commands)
+
+    @patch("shutil.which")
+    @patch("subprocess.run")
+    def test_create_pulls_missing_image(self, mock_run: Mock, mock_which: Mock) -> None:
+        """Test the image is pulled when it is not available locally."""
+        mock_which.return_value = "/usr/bin/docker"
+
+        def run(cmd: list[str], **kwargs: Any) -> Mock:
+            missing = cmd[1:3] == ["image", "inspect"]
+            return Mock(returncode=1 if missing else 0, stdout="abc123def456", stderr="")
+
+        mock_run.side_effect = run
+
+        result = self.create_sandbox_instance().create("test-env")
+
+        self.assertTrue(result.success)
+        commands = [c[0][0][1:] for c in mock_run.call_args_list]
+        self.assertIn(["pull", "ubuntu:22.04"], commands)
+
+    @patch("shutil.which")
+    @patch("subprocess.run")
+    def test_create_accepts_docker_container_names(self, mock_run: Mock, mock_which: Mock) -> None:
+        """Test names Docker accepts, including dotted ones, can be created."""
+        mock_which.return_value, mock_run.return_value = mock_docker_available()
+        sandbox = self.create_sandbox_instance()
+
+        for name in ["test-env", "node18.x", "py3.11", "build_2"]:
+            with self.subTest(name=name):
+                self.assertTrue(sandbox.create(name).success)
+                self.assertTrue((self.data_dir / f"{name}.json").exists())
+
+    @patch("shutil.which")
+    @patch("subprocess.run")
+    def test_create_invalid_name_fails(self, mock_run: Mock, mock_which: Mock) -> None:
+        """Test sandbox names that are unsafe for paths or containers are rejected."""
+        mock_which.return_value, mock_run.return_value = mock_docker_available()
+        sandbox = self.create_sandbox_instance()
+
+        for name in [
+            "",
+            ".",
+            "..",
+            "../escape",
+            ".hidden",
+            "a/b",
+            "has space",
+            "-leading-dash",
+            "semi;colon",
+        ]:
+            with self.subTest(name=name):
+                result = sandbox.create(name)
+                self.assertFalse(result.success)
+                self.assertIn("Invalid sandbox name", result.message)
+
+        self.assertEqual(list(self.data_dir.iterdir()), [])
+        # Names are rejected before any docker or filesystem work
+        mock_run.assert_not_called()
+
 
 class TestSandboxInstall(SandboxTestBase):
     """Tests for package installation in sandbox."""
@@ -189,6 +286,31 @@ class TestSandboxInstall(SandboxTestBase):
         self.assertTrue(result.success)
         self.assertIn("nginx", result.packages_installed)
 
+    @patch("shutil.which")
+    @patch("subprocess.run")
+    def test_install_metadata_write_failure_keeps_cache(
+        self, mock_run: Mock, mock_which: Mock
+    ) -> None:
+        """Test a failed metadata save leaves cached and returned info unchanged."""
+        mock_which.return_value, mock_run.return_value = mock_docker_available()
+        sandbox = self.create_sandbox_instance()
+        before = sandbox.get_sandbox("test-env")
+
+        with patch.object(Path, "write_text", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                sandbox.install("test-env", "nginx")
+
+        self.assertEqual(before.packages, [])
+        self.assertEqual(sandbox.get_sandbox("test-env").packages, [])
+
+    def test_cached_metadata_is_not_shared(self) -> None:
+        """Test changes to a returned SandboxInfo do not leak into the cache."""
+        sandbox = self.create_sandbox_instance()
+
+        sandbox.get_sandbox("test-env").packages.append("unsaved")
+
+        self.assertEqual(sandbox.get_sandbox("test-env").packages, [])
+
     @patch("shutil.which")
     @patch("subprocess.run")
     def test_install_package_failure(self, mock_run: Mock, mock_which: Mock) -> None:
@@ -213,6 +335,19 @@ class TestSandboxInstall(SandboxTestBase):
         with self.assertRaises(SandboxNotFoundError):
             self.create_sandbox_instance().install("nonexistent", "nginx")
 
+    @patch("shutil.which")
+    @patch("subprocess.run")
+    def test_install_rejects_path_traversal(self, mock_run: Mock, mock_which: Mock) -> None:
+        """Test a name resolving outside the data directory is never loaded."""
+        mock_which.return_value, mock_run.return_value = mock_docker_available()
+        outside = Path(self.temp_dir) / "outside.json"
+        outside.write_text(json.dumps(create_sandbox_metadata("outside")))
+
+        with self.assertRaises(InvalidSandboxNameError):
+            self.create_sandbox_instance().install("../outside", "nginx")
+
+        self.assertFalse(any("exec" in c[0][0] for c in mock_run.call_args_list))
+
 
 class TestSandboxTest(SandboxTestBase):
     """Tests for sandbox testing functionality."""
@@ -228,9 +363,9 @@ class TestSandboxTest(SandboxTestBase):
         mock_which.return_value = "/usr/bin/docker"
         mock_run.side_effect = [
             Mock(returncode=0, stdout="/usr/bin/docker"),
-            Mock(returncode=0, stdout="/usr/sbin/nginx"),
-            Mock(returncode=0, stdout="nginx version: 1.18"),
             Mock(returncode=0, stdout=""),
+            Mock(returncode=0, stdout="/usr/sbin/nginx"),
+            Mock(returncode=0, stdout=f"{PROBE}\nnginx version: 1.18\n{PROBE}0\n"),
         ]
 
         result = self.create_sandbox_instance().test("test-env")
@@ -238,6 +373,152 @@ class TestSandboxTest(SandboxTestBase):
         self.assertTrue(result.success)
         passed = [t for t in result.test_results if t.result == SandboxTestStatus.PASSED]
         self.assertTrue(len(passed) > 0)
+        self.assertEqual(passed[1].name, "nginx: functional (--version)")
+        self.assertEqual(passed[1].message, "nginx version: 1.18")
+
+    @patch("shutil.which")
+    @patch("subprocess.run")
+    def test_test_functional_probe_single_exec(self, mock_run: Mock, mock_which: Mock) -> None:
+        """Test all version flags are tried in one exec, reporting the one that worked."""
+        mock_which.return_value = "/usr/bin/docker"
+        mock_run.side_effect = [
+            Mock(returncode=0, stdout="/usr/bin/docker"),
+            Mock(returncode=0, stdout=""),
+            Mock(returncode=0, stdout="/usr/sbin/nginx"),
+            Mock(returncode=0, stdout=f"{PROBE}\nunknown flag\n{PROBE}\nnginx 1.18\n{PROBE}1\n"),
+        ]
+
+        result = self.create_sandbox_instance().test("test-env")
+
+        functional = result.test_results[1]
+        self.assertEqual(functional.name, "nginx: functional (-v)")
+        self.assertEqual(functional.message, "nginx 1.18")
+        probe_cmd = mock_run.call_args_list[3].args[0]
+        self.assertEqual(probe_cmd[-5:-3], ["sh", "-c"])
+        self.assertEqual(probe_cmd[-1], "nginx")
+
+    @unittest.skipUnless(shutil.which("timeout") and shutil.which("sh"), "needs sh and timeout")
+    def test_functional_probe_moves_on_after_flag_timeout(self) -> None:
+        """Test a hanging --version is killed and a later flag still passes."""
+        fake_bin = Path(self.temp_dir) / "hangs-on-version"
+        fake_bin.write_text('#!/bin/sh\n[ "$1" = --version ] && exec sleep 30\necho "fake 1.0"\n')
+        fake_bin.chmod(0o755)
+        script = docker_sandbox._build_probe_script(flag_timeout=1)
+        run_locally = subprocess.run
+
+        def fake_run(cmd: list[str], **kwargs: Any) -> Any:
+            # Run the probe on the host instead of in a container
+            if "sh" in cmd:
+                return run_locally(["sh", "-c", script, "sh", str(fake_bin)], **kwargs)
+            return Mock(returncode=0, stdout="/usr/bin/hangs-on-version", stderr="")
+
+        with (
+            patch("shutil.which", return_value="/usr/bin/docker"),
+            patch("subprocess.run", side_effect=fake_run),
+        ):
+            results = self.create_sandbox_instance()._test_package("container", "pkg")
+
+        functional = results[1]
+        self.assertEqual(functional.name, "pkg: functional (-v)")
+        self.assertEqual(functional.result, SandboxTestStatus.PASSED)
+        self.assertEqual(functional.message, "fake 1.0")
+        self.assertLess(functional.duration, 10)
+
+    @patch("shutil.which")
+    @patch("subprocess.run")
+    def test_test_multiple_packages(self, mock_run: Mock, mock_which: Mock) -> None:
+        """Test that results stay grouped by package when tested concurrently."""
+        mock_which.return_value = "/usr/bin/docker"
+        self.write_metadata("multi-env", packages=["nginx", "curl", "git"])
+
+        def fake_run(cmd: list[str], **kwargs: object) -> Mock:
+            # `which` and `dpkg -s` fail for curl only
+            if "curl" in cmd and ("which" in cmd or "-s" in cmd):
+                return Mock(returncode=1, stdout="")
+            if "sh" in cmd:
+                return Mock(returncode=0, stdout=f"{PROBE}\nv1\n{PROBE}0\n")
+            return Mock(returncode=0, stdout="/usr/bin/tool" if "which" in cmd else "")
+
+        mock_run.side_effect = fake_run
+
+        result = self.create_sandbox_instance().test("multi-env")
+
+        self.assertFalse(result.success)
+        self.assertEqual(
+            [t.name.split(":")[0] for t in result.test_results],
+            ["nginx"] * 3 + ["curl"] * 2 + ["git"] * 3,
+        )
+        failed = [t.name for t in result.test_results if t.result == SandboxTestStatus.FAILED]
+        self.assertEqual(failed, ["curl: package check"])
+
+        audits = [c for c in mock_run.call_args_list if "--audit" in c.args[0]]
+        self.assertEqual(len(audits), 1)
+        probed = [c.args[0][-1] for c in mock_run.call_args_list if "sh" in c.args[0]]
+        self.assertCountEqual(probed, ["nginx", "git"])
+
+    @patch("shutil.which")
+    @patch("subprocess.run")
+    def test_test_unhealthy_environment_skips_probes(
+        self, mock_run: Mock, mock_which: Mock
+    ) -> None:
+        """Test per-package probes are skipped when dpkg itself cannot run."""
+        mock_which.return_value = "/usr/bin/docker"
+        self.write_metadata("multi-env", packages=["nginx", "curl"])
+        mock_run.side_effect = [
+            Mock(returncode=0, stdout="/usr/bin/docker"),
+            Mock(returncode=2, stdout="", stderr="dpkg: error: database is locked"),
+        ]
+
+        result = self.create_sandbox_instance().test("multi-env")
+
+        self.assertFalse(result.success)
+        self.assertEqual(mock_run.call_count, 2)
+        self.assertEqual(
+            [t.name for t in result.test_results],
+            ["nginx: conflict check", "curl: conflict check"],
+        )
+        for test_result in result.test_results:
+            self.assertEqual(test_result.result, SandboxTestStatus.FAILED)
+            self.assertTrue(test_result.message.startswith("Environment unhealthy:"))
+        self.assertIn("database is locked", result.test_results[0].message)
+
+    @patch("shutil.which")
+    @patch("subprocess.run")
+    def test_test_results_cached_until_install(self, mock_run: Mock, mock_which: Mock) -> None:
+        """Test that repeat tests reuse results until the sandbox changes."""
+        mock_which.return_value, mock_run.return_value = mock_docker_available()
+        sandbox = self.create_sandbox_instance()
+
+        first = sandbox.test("test-env")
+        calls = mock_run.call_count
+        second = sandbox.test("test-env")
+
+        self.assertEqual(mock_run.call_count, calls)
+        self.assertEqual(
+            [t.name for t in second.test_results], [t.name for t in first.test_results]
+        )
+
+        sandbox.install("test-env", "curl")
+        calls = mock_run.call_count
+        sandbox.test("test-env", "nginx")
+
+        self.assertGreater(mock_run.call_count, calls)
+
+    @patch("shutil.which")
+    @patch("subprocess.run")
+    def test_atest_concurrent_sandboxes(self, mock_run: Mock, mock_which: Mock) -> None:
+        """Test the async variant returns the same results as test()."""
+        mock_which.return_value, mock_run.return_value = mock_docker_available()
+        self.write_metadata("other-env", packages=["curl"])
+        sandbox = self.create_sandbox_instance()
+
+        async def run_both() -> list[Any]:
+            return await asyncio.gather(sandbox.atest("test-env"), sandbox.atest("other-env"))
+
+        first, second = asyncio.run(run_both())
+
+        self.assertTrue(first.test_results[0].name.startswith("nginx:"))
+        self.assertTrue(second.test_results[0].name.startswith("curl:"))
 
     @patch("shutil.which")
     @patch("subprocess.run")
@@ -279,6 +560,19 @@ class TestSandboxPromote(SandboxTestBase):
         self.assertFalse(result.success)
         self.assertIn("not installed in sandbox", result.message)
 
+    @patch("subprocess.run")
+    def test_promote_no_packages_rejected(self, mock_run: Mock) -> None:
+        """Test an empty package list never reaches the host package manager."""
+        sandbox = self.create_sandbox_instance()
+
+        for packages in ([], "", ["nginx", ""]):
+            with self.subTest(packages=packages):
+                result = sandbox.promote("test-env", packages, dry_run=False)
+                self.assertFalse(result.success)
+                self.assertIn("No package specified", result.message)
+
+        mock_run.assert_not_called()
+
     @patch("subprocess.run")
     def test_promote_success(self, mock_run: Mock) -> None:
         """Test successful promotion."""
@@ -290,6 +584,24 @@ class TestSandboxPromote(SandboxTestBase):
         call_args = mock_run.call_args[0][0]
         self.assertEqual(call_args, ["sudo", "apt-get", "install", "-y", "nginx"])
 
+    @patch("subprocess.run")
+    def test_promote_multiple_packages_single_install(self, mock_run: Mock) -> None:
+        """Test promoting several packages uses one apt-get install."""
+        self.write_metadata("test-env", packages=["nginx", "redis"])
+        mock_run.return_value = Mock(returncode=0, stdout="", stderr="")
+
+        result = self.create_sandbox_instance().promote(
+            "test-env", ["nginx", "redis"], dry_run=False
+        )
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.packages_installed, ["nginx", "redis"])
+        install_calls = [c for c in mock_run.call_args_list if "install" in c[0][0]]
+        self.assertEqual(len(install_calls), 1)
+        self.assertEqual(
+            install_calls[0][0][0], ["sudo", "apt-get", "install", "-y", "nginx", "redis"]
+        )
+
 
 class TestSandboxCleanup(SandboxTestBase):
     """Tests for sandbox cleanup."""
@@ -319,6 +631,25 @@ class TestSandboxCleanup(SandboxTestBase):
 
         self.assertTrue(result.success)
 
+    @patch("shutil.which")
+    @patch("subprocess.run")
+    def test_cleanup_rejects_path_traversal(self, mock_run: Mock, mock_which: Mock) -> None:
+        """Test forced cleanup cannot unlink metadata outside the data directory."""
+        mock_which.return_value, mock_run.return_value = mock_docker_available()
+        outside = Path(self.temp_dir) / "outside.json"
+        outside.write_text("{}")
+        sandbox = self.create_sandbox_instance()
+
+        for name in ["../outside", "../../tmp/x"]:
+            with self.subTest(name=name):
+                with self.assertRaises(InvalidSandboxNameError):
+                    sandbox.cleanup(name, force=True)
+
+        self.assertTrue(outside.exists())
+        docker_actions = [c[0][0][1] for c in mock_run.call_args_list]
+        self.assertNotIn("rm", docker_actions)
+        self.assertNotIn("stop", docker_actions)
+
 
 class TestSandboxList(SandboxTestBase):
     """Tests for listing sandboxes."""
@@ -337,6 +668,55 @@ class TestSandboxList(SandboxTestBase):
         self.assertEqual(len(sandboxes), 3)
         self.assertEqual({s.name for s in sandboxes}, {"env1", "env2", "env3"})
 
+    def test_iter_sandboxes_skips_corrupt_metadata(self) -> None:
+        """Test lazy iteration yields valid sandboxes and skips bad files."""
+        self.write_metadata("env1")
+        (self.data_dir / "broken.json").write_text("{not json")
+
+        sandboxes = self.create_sandbox_instance().iter_sandboxes()
+
+        self.assertNotIsInstance(sandboxes, list)
+        self.assertEqual([s.name for s in sandboxes], ["env1"])
+
+
+class TestSandboxMetadataCache(SandboxTestBase):
+    """Tests for the in-process sandbox metadata cache."""
+
+    def test_load_reads_disk_once(self) -> None:
+        """Test repeated lookups are served from the cache."""
+        self.write_metadata("test-env", packages=["nginx"])
+        sandbox = self.create_sandbox_instance()
+
+        first = sandbox.get_sandbox("test-env")
+        (self.data_dir / "test-env.json").unlink()
+
+        # Served from the cache, as an equal copy the caller may modify
+        self.assertEqual(sandbox.get_sandbox("test-env"), first)
+        self.assertIsNot(sandbox.get_sandbox("test-env"), first)
+
+    def test_list_warms_cache(self) -> None:
+        """Test listing sandboxes populates the cache."""
+        self.write_metadata("env1")
+        sandbox = self.create_sandbox_instance()
+
+        listed = sandbox.list_sandboxes()
+        (self.data_dir / "env1.json").unlink()
+
+        self.assertEqual(sandbox.get_sandbox("env1"), listed[0])
+
+    @patch("shutil.which")
+    @patch("subprocess.run")
+    def test_cleanup_invalidates_cache(self, mock_run: Mock, mock_which: Mock) -> None:
+        """Test cleanup removes the cached entry."""
+        mock_which.return_value, mock_run.return_value = mock_docker_available()
+        self.write_metadata("test-env")
+        sandbox = self.create_sandbox_instance()
+        sandbox.get_sandbox("test-env")
+
+        sandbox.cleanup("test-env")
+
+        self.assertIsNone(sandbox.get_sandbox("test-env"))
+
 
 class TestSandboxExec(SandboxTestBase):
     """Tests for command execution in sandbox."""
@@ -416,6 +796,17 @@ class TestSandboxInfo(unittest.TestCase):
         self.assertEqual(info.state, SandboxState.RUNNING)
         self.assertIn("nginx", info.packages)
 
+    def test_to_json_round_trip(self) -> None:
+        """Test JSON serialization round-trips through from_dict."""
+        info = SandboxInfo.from_dict(create_sandbox_metadata("test", ["nginx"]))
+
+        self.assertEqual(SandboxInfo.from_dict(json.loads(info.to_json())), info)
+
+    def test_from_dict_unknown_state(self) -> None:
+        """Test an unknown state is reported like other malformed metadata."""
+        with self.assertRaises(KeyError):
+            SandboxInfo.from_dict(create_sandbox_metadata("test", state="exploded"))
+
 
 class TestDockerAvailableFunction(unittest.TestCase):
     """Tests for docker_available() convenience function."""
@@ -52,29 +52,55 @@ def test_init_wsl_detection():
         assert manager.host_gid == 1001
 
 
+def _dir_entry(base, name, uid=None, is_dir=False):
+    """Build a fake os.DirEntry for scandir-based scans."""
+    entry = MagicMock()
+    entry.name = name
+    entry.path = os.path.join(base, name)
+    entry.is_dir.return_value = is_dir
+    entry.is_symlink.return_value = False
+    entry.stat.return_value.st_uid = uid
+    return entry
+
+
 def test_diagnose_finds_mismatched_uids(manager):
     """Confirm the tool identifies files not owned by the host (UID 1000)."""
-    with (
-        patch("cortex.permission_manager.os.walk") as mock_walk,
-        patch("cortex.permission_manager.os.stat") as mock_stat,
-    ):
+    with patch("cortex.permission_manager.os.scandir") as mock_scandir:
         base = os.path.normpath("/dummy/path")
         # File 1: Owned by root (0) - Should be flagged
         # File 2: Owned by host (1000) - Should be ignored
-        mock_walk.return_value = [(base, [], ["root_file.txt", "user_file.txt"])]
-
-        root_stat = MagicMock()
-        root_stat.st_uid = 0
-
-        user_stat = MagicMock()
-        user_stat.st_uid = 1000
-
-        mock_stat.side_effect = [root_stat, user_stat]
+        # Excluded directory - Should not be descended into
+        mock_scandir.return_value.__iter__.return_value = [
+            _dir_entry(base, "root_file.txt", uid=0),
+            _dir_entry(base, "user_file.txt", uid=1000),
+            _dir_entry(base, "node_modules", is_dir=True),
+        ]
 
         results = manager.diagnose()
 
         assert len(results) == 1
         assert os.path.join(base, "root_file.txt") in results
+        mock_scandir.assert_called_once_with(base)
+
+
+def test_diagnose_walks_subdirectories(tmp_path):
+    """Confirm nested files are scanned and excluded directories are pruned."""
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "src" / "pkg" / "module.py").write_text("")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "dep.js").write_text("")
+
+    # A host UID no file can have, so every scanned file is reported.
+    with (
+        patch("os.getuid", create=True, return_value=-1),
+        patch("os.getgid", create=True, return_value=-1),
+        patch("platform.system", return_value="Linux"),
+    ):
+        manager = PermissionManager(str(tmp_path))
+
+    results = manager.diagnose()
+
+    assert results == [str(tmp_path / "src" / "pkg" / "module.py")]
 
 
 def test_check_compose_config_with_valid_yaml(manager):
@@ -4,24 +4,33 @@ Unit tests for sandboxed command executor.
 Tests security features, validation, and execution.
 """
 
+import asyncio
 import builtins
 import contextlib
+import errno
+import logging
 import os
+import re
 import shutil
 import subprocess
 import sys
 import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import MagicMock, patch
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
 
+from cortex.sandbox import sandbox_executor
 from cortex.sandbox.sandbox_executor import (
     CommandBlocked,
     ExecutionResult,
     SandboxExecutor,
+    _AuditQueueHandler,
+    _BufferedFileHandler,
 )
-from cortex.validators import DANGEROUS_PATTERNS
+from cortex.validators import DANGEROUS_PATTERNS, DANGEROUS_TRIGGERS, has_dangerous_pattern
 
 
 class TestSandboxExecutor(unittest.TestCase):
@@ -124,6 +133,19 @@ class TestSandboxExecutor(unittest.TestCase):
         self.assertEqual(result.stdout, "output")
         self.assertFalse(result.blocked)
 
+    @patch("subprocess.Popen")
+    def test_execute_truncates_output(self, mock_popen):
+        """Test captured output is capped before it is kept in the result."""
+        mock_process = MagicMock()
+        mock_process.communicate.return_value = ("x" * 100, "short")
+        mock_process.returncode = 0
+        mock_popen.return_value = mock_process
+
+        result = self.executor.execute('echo "test"', dry_run=False, max_output_chars=10)
+
+        self.assertTrue(result.stdout.startswith("x" * 10 + "\n[TRUNCATED] 90"))
+        self.assertEqual(result.stderr, "short")
+
     def test_execute_dry_run(self):
         """Test dry-run mode."""
         result = self.executor.execute("apt-get update", dry_run=True)
@@ -135,6 +157,20 @@ class TestSandboxExecutor(unittest.TestCase):
         assert preview is not None
         self.assertIn("apt-get", preview)
 
+    def test_aexecute_concurrent(self):
+        """Test concurrent async executions get separate sessions."""
+
+        async def run_both():
+            return await asyncio.gather(
+                self.executor.aexecute("echo a", dry_run=True),
+                self.executor.aexecute("echo b", dry_run=True),
+            )
+
+        results = asyncio.run(run_both())
+
+        self.assertTrue(all(r.success for r in results))
+        self.assertEqual(len(self.executor.rollback_snapshots), 2)
+
     def test_execute_blocked_command(self):
         """Test execution of blocked command."""
         with self.assertRaises(CommandBlocked):
@@ -213,6 +249,16 @@ class TestSandboxExecutor(unittest.TestCase):
             # Adjust based on security requirements
             # For now, we just test that validation runs
 
+    def test_path_validation_allowed_directories(self):
+        """Test paths inside allowed directories pass and critical ones are blocked."""
+        self.assertIsNone(self.executor._validate_paths("ls /tmp/build"))
+        self.assertIsNone(self.executor._validate_paths("cat ~/notes.txt"))
+        self.assertIn("critical directory", self.executor._validate_paths("ls /boot") or "")
+        self.assertIn(
+            "critical directory",
+            self.executor._validate_paths("cat ../../../etc/passwd") or "",
+        )
+
     def test_resource_limits(self):
         """Test that resource limits are set in firejail command."""
         if not self.executor.firejail_path:
@@ -226,6 +272,28 @@ class TestSandboxExecutor(unittest.TestCase):
         self.assertIn("--rlimit-as", cmd_str)
         self.assertIn("--private", cmd_str)
 
+    def test_firejail_command_per_limits(self):
+        """Test the firejail options follow each executor's limits."""
+        small = SandboxExecutor(
+            firejail_path="/usr/bin/firejail", log_file=self.log_file, max_cpu_cores=1
+        )
+        large = SandboxExecutor(
+            firejail_path="/usr/bin/firejail", log_file=self.log_file, max_cpu_cores=4
+        )
+
+        small_cmd = small._create_firejail_command("echo 'a b'")
+        self.assertEqual(small_cmd[0], "/usr/bin/firejail")
+        self.assertIn("--cpu=1", small_cmd)
+        self.assertEqual(small_cmd[-2:], ["echo", "a b"])
+        self.assertIn("--cpu=4", large._create_firejail_command("echo test"))
+
+    def test_byte_limits(self):
+        """Test that MB limits are exposed in bytes."""
+        executor = SandboxExecutor(log_file=self.log_file, max_memory_mb=512, max_disk_mb=64)
+
+        self.assertEqual(executor.max_memory_bytes, 512 * 1024 * 1024)
+        self.assertEqual(executor.max_disk_bytes, 64 * 1024 * 1024)
+
     def test_execution_result_properties(self):
         """Test ExecutionResult properties."""
         result = ExecutionResult(
@@ -290,6 +358,150 @@ class TestSandboxExecutor(unittest.TestCase):
             log_content = f.read()
             self.assertIn("SandboxExecutor", log_content)
 
+    def test_security_violation_written_before_raise(self):
+        """Test violations reach the log file before CommandBlocked propagates."""
+        with self.assertRaises(CommandBlocked):
+            self.executor.execute("rm -rf /", dry_run=False)
+
+        with open(self.log_file) as f:
+            self.assertIn("Security violation: rm -rf /", f.read())
+
+    @patch("os.access", return_value=True)
+    @patch("shutil.which")
+    def test_firejail_lookup_caches_only_found_path(self, mock_which, mock_access):
+        """Test a missing firejail is looked up again, but a found one is reused."""
+        mock_which.side_effect = [None, "/usr/bin/firejail"]
+
+        with patch.object(sandbox_executor, "_firejail_path", None):
+            self.assertIsNone(sandbox_executor._which_firejail())
+            self.assertEqual(sandbox_executor._which_firejail(), "/usr/bin/firejail")
+            self.assertEqual(sandbox_executor._which_firejail(), "/usr/bin/firejail")
+
+        self.assertEqual(mock_which.call_count, 2)
+
+    @patch("os.access", return_value=False)
+    @patch("shutil.which", return_value=None)
+    def test_firejail_lookup_notices_removed_binary(self, mock_which, mock_access):
+        """Test a cached firejail path that is no longer executable is dropped."""
+        with patch.object(sandbox_executor, "_firejail_path", "/usr/bin/firejail"):
+            self.assertIsNone(SandboxExecutor(log_file=self.log_file).firejail_path)
+
+        mock_which.assert_called_once_with("firejail")
+
+    def test_audit_log_write_error_keeps_command_blocked(self):
+        """Test a failing log file does not replace CommandBlocked."""
+        (audit_handler,) = (h for h in self.executor.logger.handlers if hasattr(h, "_listener"))
+        (file_handler,) = audit_handler._listener.handlers
+        stream = MagicMock()
+        stream.write.side_effect = OSError(errno.ENOSPC, "No space left on device")
+
+        with patch.object(file_handler, "stream", stream), patch("logging.raiseExceptions", False):
+            with self.assertRaises(CommandBlocked):
+                self.executor.execute("rm -rf /", dry_run=False)
+            self.executor.flush_audit_log()
+
+        stream.write.assert_called()
+
+    def test_audit_writer_survives_handler_error(self):
+        """Test a failing target handler does not stop later records or hang flush."""
+        target = logging.Handler()
+        target.handle = MagicMock(side_effect=[RuntimeError("disk gone"), True])
+        handler = _AuditQueueHandler(target)
+        self.addCleanup(handler.close)
+
+        with patch("logging.raiseExceptions", False):
+            for msg in ("first", "second"):
+                handler.emit(logging.makeLogRecord({"msg": msg, "levelno": logging.INFO}))
+            handler.flush()
+
+        self.assertEqual(target.handle.call_count, 2)
+
+    def test_audit_emit_never_waits_for_writer(self):
+        """Test logging a violation returns while the writer is still busy."""
+        release = threading.Event()
+        target = logging.Handler()
+        target.handle = MagicMock(side_effect=lambda record: release.wait())
+        handler = _AuditQueueHandler(target)
+        self.addCleanup(handler.close)
+        self.addCleanup(release.set)
+        record = logging.makeLogRecord({"msg": "violation", "levelno": logging.WARNING})
+
+        start = time.monotonic()
+        handler.emit(record)
+
+        self.assertLess(time.monotonic() - start, 2)
+
+    @unittest.skipIf(os.name == "nt", "preexec_fn is POSIX-only")
+    @patch("subprocess.Popen")
+    @patch.object(SandboxExecutor, "validate_command")
+    def test_resource_limit_failure_not_logged_in_child(self, mock_validate, mock_popen):
+        """Test preexec_fn reports setrlimit failures without using logging."""
+        mock_validate.return_value = (True, None)
+        mock_process = MagicMock(returncode=0)
+        mock_process.communicate.return_value = ("", "")
+        mock_popen.return_value = mock_process
+
+        with patch.object(self.executor, "firejail_path", None):
+            self.executor.execute("echo hi", dry_run=False)
+        preexec_fn = mock_popen.call_args.kwargs["preexec_fn"]
+
+        with (
+            patch("resource.setrlimit", side_effect=OSError("not permitted")),
+            patch("os.write") as mock_write,
+            patch.object(self.executor.logger, "warning") as mock_warning,
+        ):
+            preexec_fn()
+
+        mock_warning.assert_not_called()
+        mock_write.assert_called_once()
+        self.assertEqual(mock_write.call_args.args[0], 2)
+
+    def test_audit_records_reach_disk_without_flush(self):
+        """Test execution records are written once the writer is idle, with no flush()."""
+        for i in range(5):
+            self.executor.execute(f"echo unflushed {i}", dry_run=True)
+
+        deadline = time.monotonic() + 5
+        content = ""
+        while time.monotonic() < deadline:
+            with open(self.log_file) as f:
+                content = f.read()
+            if content.count("Command executed: echo unflushed") == 5:
+                break
+            time.sleep(0.01)
+
+        self.assertEqual(content.count("Command executed: echo unflushed"), 5)
+
+    def test_buffered_handler_flushes_after_interval(self):
+        """Test pending records are written once the oldest exceeds flush_interval."""
+        log_file = os.path.join(self.temp_dir, "interval.log")
+        handler = _BufferedFileHandler(log_file, capacity=1000, flush_interval=0.05)
+        self.addCleanup(handler.close)
+
+        def info(msg):
+            return logging.makeLogRecord({"msg": msg, "levelno": logging.INFO})
+
+        handler.emit(info("first"))
+        with open(log_file) as f:
+            self.assertEqual(f.read(), "")
+
+        time.sleep(0.06)
+        handler.emit(info("second"))
+        with open(log_file) as f:
+            self.assertEqual(f.read().split(), ["first", "second"])
+
+    def test_flush_audit_log_writes_queued_records(self):
+        """Test flush_audit_log returns once queued records are on disk."""
+        for i in range(5):
+            self.executor.execute(f"echo queued {i}", dry_run=True)
+
+        self.executor.flush_audit_log()
+
+        with open(self.log_file) as f:
+            content = f.read()
+        for i in range(5):
+            self.assertIn(f"Command executed: echo queued {i}", content)
+
 
 class TestSecurityFeatures(unittest.TestCase):
     """Test security-specific features."""
@@ -316,19 +528,40 @@ class TestSecurityFeatures(unittest.TestCase):
                 test_cmd = "python -c \"__import__('os')\""
             elif "/dev/(?!null" in pattern:
                 test_cmd = "echo hi > /dev/sda"
+            elif pattern.startswith(":"):
+                test_cmd = ":(){ :|:& };:"
             else:
                 test_cmd = pattern.replace(r"\s+", " ").replace(r"[/\*]", "/")
+                test_cmd = test_cmd.replace(r"\s*$", "")
                 test_cmd = test_cmd.replace(r"\s*", " ")
                 test_cmd = test_cmd.replace(r"\$HOME", "$HOME")
+                test_cmd = test_cmd.replace(r"\b", "")
                 test_cmd = test_cmd.replace(r"\.", ".")
                 test_cmd = test_cmd.replace(r"\+", "+")
                 test_cmd = test_cmd.replace(r"\|", "|")
                 test_cmd = test_cmd.replace(r".*", "http://example.com/script.sh")
                 test_cmd = test_cmd.replace(r"[0-7]{3,4}", "777")
 
+            # The sample must exercise this pattern, and the trigger prefilter
+            # must not skip it
+            self.assertRegex(test_cmd, re.compile(pattern, re.IGNORECASE))
+            self.assertTrue(has_dangerous_pattern(test_cmd), f"Prefilter skips pattern: {pattern}")
             is_valid, _ = self.executor.validate_command(test_cmd)
             self.assertFalse(is_valid, f"Pattern should be blocked: {pattern}")
 
+    def test_dangerous_triggers_are_literal_text(self):
+        """Test triggers are plain text, so regex syntax cannot stand in for one."""
+        for trigger in DANGEROUS_TRIGGERS:
+            self.assertEqual(trigger, trigger.lower())
+            self.assertNotRegex(trigger, r"[\\.^$*+?{}\[\]|()]", "Trigger is regex syntax")
+
+    def test_dangerous_pattern_reports_first_match(self):
+        """Test the violation names the first listed pattern that matches."""
+        is_valid, violation = self.executor.validate_command("fdisk /dev/sda; rm -rf /")
+
+        self.assertFalse(is_valid)
+        self.assertEqual(violation, f"Dangerous pattern detected: {DANGEROUS_PATTERNS[0]}")
+
     def test_path_traversal_protection(self):
         """Test protection against path traversal attacks."""
         traversal_commands = [